@@ -0,0 +1,165 @@
+"""
+small library for loading site statistics data files, caching slow text file reads
+as binary numpy files and expensive calculations on disk
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Iterable, Tuple
+import hashlib
+import os
+import sys
+
+import numpy as np
+from joblib import Memory
+
+
+# on-disk memoization of expensive calculations, persists between script runs
+# results are keyed on the function's code and a hash of its arguments
+memory = Memory(".cache", verbose=0)
+
+
+@lru_cache(maxsize=None)
+def get_source_key(file_name: str) -> str:
+    """
+    hash a source file, to key cached results on code the cached function calls
+    joblib only checks the code of the cached function itself
+    :param file_name: path to source file
+    :return: hex digest of file contents
+    """
+
+    with open(file_name, "rb") as file:
+        return hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+
+
+@memory.cache
+def _call_cached(function: Callable, source_key: str, *args, **kwargs):
+    """
+    call a function, caching the result on its arguments and its module's source
+    :param function: module-level function to call
+    :param source_key: hash of the function's module, only used as part of the cache key
+    :param args: positional arguments of function
+    :param kwargs: keyword arguments of function
+    :return: result of function
+    """
+
+    # pylint: disable=unused-argument
+    return function(*args, **kwargs)
+
+
+def cache_with_module(function: Callable) -> Callable:
+    """
+    memoize a function on disk, invalidating cached results whenever any code in the
+    module it is defined in changes, not only the function itself
+    :param function: module-level function, whose work is done in its own module
+    :return: function with the same signature, returning cached results when possible
+    """
+
+    source_key = get_source_key(sys.modules[function.__module__].__file__)
+
+    def cached_function(*args, **kwargs):
+        return _call_cached(function, source_key, *args, **kwargs)
+
+    return cached_function
+
+
+def load_cached(path: str, **loadtxt_kwargs) -> np.ndarray:
+    """
+    load an array from a text file, using a binary .npy copy of it if one is up to date
+    the binary copy is written next to the text file on the first read
+    :param path: path to text file
+    :param loadtxt_kwargs: keyword arguments passed to np.loadtxt on the first read
+        these should be the same every time a given file is loaded
+    :return: array stored in text file
+    """
+
+    cache_path = f"{os.path.splitext(path)[0]}.npy"
+
+    # only trust the cache if it is newer than the text file it was created from
+    is_up_to_date = os.path.exists(cache_path) and (
+        os.path.getmtime(cache_path) >= os.path.getmtime(path)
+    )
+    if is_up_to_date:
+        # read into memory, not as a memmap, so cached calculations hash the array the
+        # same way whether it came from the text file or from its binary copy
+        return np.load(cache_path)
+
+    array = np.loadtxt(path, **loadtxt_kwargs)
+
+    # write to a temporary file first, an interrupted write would otherwise leave a
+    # truncated copy that is newer than the text file and trusted by every later read
+    temporary_path = f"{cache_path}.tmp"
+    with open(temporary_path, "wb") as file:
+        np.save(file, array)
+    os.replace(temporary_path, cache_path)
+
+    return array
+
+
+def stack_rows(arrays: Iterable[np.ndarray], num_rows: int) -> np.ndarray:
+    """
+    copy equally sized arrays into the rows of one preallocated array as they arrive
+    the array is allocated from the first one, so only one row is ever held separately
+    :param arrays: iterable of arrays, shape of each is (number of values,)
+    :param num_rows: number of arrays in iterable
+    :return: stacked array, shape is (number of arrays, number of values)
+    """
+
+    arrays = iter(arrays)
+    first = next(arrays)
+    stacked = np.empty((num_rows, *first.shape), dtype=first.dtype)
+    stacked[0] = first
+
+    num_filled = 1
+    for array in arrays:
+        stacked[num_filled] = array
+        num_filled += 1
+
+    assert num_filled == num_rows
+
+    return stacked
+
+
+def load_site_data(
+    system: str, step: int, num_types: int, max_workers: int = 8
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    load the energetics and volumetrics data of a system at a timestep
+    files are read concurrently, loading is mostly waiting on disk
+    :param system: name of system
+    :param step: MC-MD timestep
+    :param num_types: number of atom types in system
+    :param max_workers: maximum number of files to read at once
+    :return: 5-tuple of occupying energies, vacant energies, enthalpy per atom,
+        occupying volumes, and vacant volumes
+    """
+
+    occupying_paths = {
+        data_type: [
+            f"{data_type}_data/{system}/occupying{t + 1:.0f}_{step:.0f}.txt"
+            for t in range(num_types)
+        ]
+        for data_type in ["energetics", "volumetrics"]
+    }
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # submit every file before waiting on any of them
+        occupying_energies = executor.map(load_cached, occupying_paths["energetics"])
+        occupying_volumes = executor.map(load_cached, occupying_paths["volumetrics"])
+        vacant_energies = executor.submit(
+            load_cached, f"energetics_data/{system}/vacant_{step:.0f}.txt"
+        )
+        enthalpy_per_atom = executor.submit(
+            load_cached, f"energetics_data/{system}/enthalpy_{step:.0f}.txt"
+        )
+        vacant_volumes = executor.submit(
+            load_cached, f"volumetrics_data/{system}/vacant_{step:.0f}.txt"
+        )
+
+        return (
+            stack_rows(occupying_energies, num_types),
+            vacant_energies.result(),
+            enthalpy_per_atom.result(),
+            stack_rows(occupying_volumes, num_types),
+            vacant_volumes.result(),
+        )
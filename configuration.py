@@ -0,0 +1,92 @@
+"""
+small library for loading the config file once into a frozen structure
+per-system lookups are resolved when the file is loaded instead of in plotting loops
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Tuple
+import json
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+
+    """
+    parsed contents of a config file
+    type maps are keyed by integer atom type labels, and map to atom abbreviations
+    type name maps map integer atom type labels to full atom names
+    type info maps map integer atom type labels to (abbreviation, radius, color) tuples
+    """
+
+    systems: Tuple[str, ...]
+    number_of_frames: int
+    final_step: int
+    number_of_nearest_neighbors: Dict[str, int]
+    structure: Dict[str, str]
+    dominant_order_parameter: Dict[str, str]
+    atoms: Dict[str, Tuple[str, ...]]
+    atom_colors: Dict[str, Tuple[float, ...]]
+    atom_radii: Dict[str, float]
+    atom_abbreviations: Dict[str, str]
+    system_colors: Dict[str, str]
+    system_line_styles: Dict[str, str]
+    system_labels: Dict[str, str]
+    alignments: Dict[str, int]
+    temperature_spacing: int
+    type_maps: Dict[str, Dict[int, str]]
+    type_name_maps: Dict[str, Dict[int, str]]
+    type_info_maps: Dict[str, Dict[int, Tuple[str, float, Tuple[float, ...]]]]
+
+
+@lru_cache(maxsize=None)
+def load_config(config_file_name: str = "config.json") -> Config:
+    """
+    load a config file, parsing it only once per process
+    :param config_file_name: path to config file
+    :return: frozen config, shared between callers so it should not be modified
+    """
+
+    with open(config_file_name, "r", encoding="utf8") as file:
+        config = json.load(file)
+
+    type_info_maps = {
+        system: {
+            int(key): (
+                config["Atom Abbreviations"][val],
+                config["Atom Radii"][val],
+                tuple(config["Atom Colors"][val]),
+            )
+            for key, val in type_map.items()
+        }
+        for system, type_map in config["Type Maps"].items()
+    }
+
+    return Config(
+        systems=tuple(config["Systems"]),
+        number_of_frames=config["Number of Frames"],
+        final_step=config["Final Step"],
+        number_of_nearest_neighbors=config["Number of Nearest Neighbors"],
+        structure=config["Structure"],
+        dominant_order_parameter=config["Dominant Order Parameter"],
+        atoms={system: tuple(atoms) for system, atoms in config["Atoms"].items()},
+        atom_colors={
+            atom: tuple(color) for atom, color in config["Atom Colors"].items()
+        },
+        atom_radii=config["Atom Radii"],
+        atom_abbreviations=config["Atom Abbreviations"],
+        system_colors=config["System Colors"],
+        system_line_styles=config["System Line Styles"],
+        system_labels=config["System Labels"],
+        alignments=config["Alignments"],
+        temperature_spacing=config["Temperature Spacing"],
+        type_maps={
+            system: {key: abbreviation for key, (abbreviation, _, _) in info.items()}
+            for system, info in type_info_maps.items()
+        },
+        type_name_maps={
+            system: {int(key): val for key, val in type_map.items()}
+            for system, type_map in config["Type Maps"].items()
+        },
+        type_info_maps=type_info_maps,
+    )
@@ -0,0 +1,22 @@
+"""
+small library of physical constants and unit conversions shared by the plotting scripts
+"""
+
+import numpy as np
+
+# boltzmann constant in eV / K
+BOLTZMANN_CONSTANT = 8.615e-5
+
+# inverse temperature grid in 1 / eV, shared by every script and system
+# read-only since the same array is reused everywhere
+BETA_VALS = np.linspace(10.0, 30.0, 10_000)
+BETA_VALS.flags.writeable = False
+
+
+def temp_beta_conversion(x):
+    """
+    temperature <-> beta conversion
+    works for scalars and elementwise for arrays, e.g. an array of axis ticks
+    """
+
+    return 1 / (BOLTZMANN_CONSTANT * x)
@@ -4,21 +4,14 @@
 script for creating fluctuation vs. temperature plot
 """
 
-import json
-
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 
-
-def temp_beta_conversion(x: float) -> float:
-    """
-    temperature <-> beta conversion
-    """
-
-    boltzmann_constant = 8.615e-5
-
-    return 1 / (boltzmann_constant * x)
+from caching import load_cached
+from configuration import load_config
+from constants import BETA_VALS
+from plotting import add_temperature_axis
 
 
 def main():
@@ -28,26 +21,28 @@ def main():
 
     mpl.use("Agg")
 
-    with open("config.json", "r", encoding="utf8") as file:
-        config = json.load(file)
+    config = load_config()
 
-    beta_vals = np.linspace(10.0, 30.0, 10_000)
+    for system in config.systems:
+        chemical_potentials = load_cached(f"chemical_potentials_{system}.txt")
 
-    for system in config["Systems"]:
-        chemical_potentials = np.loadtxt(f"chemical_potentials_{system}.txt")
+        # exponentiate in place to avoid a second (num temperatures, num types) array
+        fugacities = BETA_VALS[:, np.newaxis] * chemical_potentials[np.newaxis, :]
+        np.exp(fugacities, out=fugacities)
+        sum_of_fugacities = np.sum(fugacities, axis=1)
+        squared_sum = sum_of_fugacities * sum_of_fugacities
 
-        fugacities = np.exp(np.outer(beta_vals, chemical_potentials))
-        squared_sum = np.sum(fugacities, axis=1) ** 2
-        sum_squared = np.sum(fugacities ** 2, axis=1)
+        # row-wise dot product, avoids allocating fugacities ** 2
+        sum_squared = np.einsum("ij,ij->i", fugacities, fugacities)
 
         plot_kwargs = {
-            "color": config["System Colors"][system],
-            "linestyle": config["System Line Styles"][system],
-            "label": config["System Labels"][system],
+            "color": config.system_colors[system],
+            "linestyle": config.system_line_styles[system],
+            "label": config.system_labels[system],
         }
 
         fluctuations = np.sqrt(1 - sum_squared / squared_sum)
-        plt.plot(beta_vals, fluctuations, **plot_kwargs)
+        plt.plot(BETA_VALS, fluctuations, **plot_kwargs)
 
     plt.grid()
     plt.legend()
@@ -55,26 +50,7 @@ def main():
 
     ax = plt.gca()
 
-    secx = ax.secondary_xaxis(
-        "top", functions=(temp_beta_conversion, temp_beta_conversion)
-    )
-    temperature_spacing = config["Temperature Spacing"]
-    min_temperature = temperature_spacing * round(
-        temp_beta_conversion(max(ax.get_xticks())) / temperature_spacing
-    )
-    max_temperature = temperature_spacing * round(
-        temp_beta_conversion(min(ax.get_xticks())) / temperature_spacing
-    )
-    secx.set_xticks(
-        np.arange(
-            min_temperature,
-            max_temperature + temperature_spacing,
-            step=temperature_spacing,
-        )
-    )
-    secx.set_xlabel("temperature ($10^2$ K)")
-    new_labels = [f"{x / 100:.0f}" for x in secx.get_xticks()]
-    secx.set_xticklabels(new_labels)
+    add_temperature_axis(ax, config.temperature_spacing)
     plt.xlabel(r"inverse temperature ($\beta$) (eV$^{-1}$)")
     plt.ylabel(r"occupation number fluctuation ($\Delta n$)")
 
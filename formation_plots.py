@@ -4,23 +4,109 @@
 script for creating formation plots at the final MC-MD step
 """
 
-import json
+from itertools import islice
 import re
 
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib as mpl
-from site_statistics import get_vacancy_characteristics
+from caching import cache_with_module, load_cached, load_site_data
+from configuration import load_config
+from constants import BETA_VALS
+from plotting import add_temperature_axis
+from site_statistics import MAX_BLOCK_BYTES, get_vacancy_characteristics
+
+
+# matches either the number of atoms or one of the box bounds in a LAMMPS data file header
+HEADER_PATTERN = re.compile(
+    r"(?P<num_atoms>\d+) atoms"
+    r"|(?P<lo>-?\d+\.\d+?) (?P<hi>-?\d+\.\d+?) (?P<axis>[xyz])lo (?P=axis)hi"
+)
+
+
+def get_two_state_characteristics(
+    beta_vals: np.ndarray,
+    formation_energies: np.ndarray,
+    formation_volumes: np.ndarray,
+    dtype: type = np.float64,
+) -> tuple:
+    """
+    vacancy concentration and formation quantities treating each site as a two-state system
+    :param beta_vals: array of beta values, shape is (number of temperatures,)
+    :param formation_energies: formation energy of each site, shape is (number of sites,)
+    :param formation_volumes: formation volume of each site, shape is (number of sites,)
+    :param dtype: floating point type to calculate in, single precision halves the size
+        of the (temperatures, sites) buffers, but vacant probabilities flush to 0 once
+        beta times a formation energy exceeds about 100, giving nan formation quantities
+    :return: 3-tuple of concentration, formation energy, and formation volume
+        each member of tuple has shape (number of temperatures,)
+    """
+
+    beta_vals = np.asarray(beta_vals, dtype=dtype)
+    formation_energies = np.asarray(formation_energies, dtype=dtype)
+    formation_volumes = np.asarray(formation_volumes, dtype=dtype)
+    num_temperatures, num_sites = len(beta_vals), len(formation_energies)
+
+    concentration = np.empty(num_temperatures, dtype=dtype)
+    formation_energy = np.empty(num_temperatures, dtype=dtype)
+    formation_volume = np.empty(num_temperatures, dtype=dtype)
+
+    # temperatures are swept in cache-sized blocks, so the two (temperatures, sites)
+    # buffers are allocated once and do not grow with the number of temperatures
+    block_length = max(1, MAX_BLOCK_BYTES // formation_energies.nbytes)
+    probability_buffer = np.empty(
+        (min(block_length, num_temperatures), num_sites), dtype
+    )
+    weight_buffer = np.empty_like(probability_buffer)
+
+    for start in range(0, num_temperatures, block_length):
+        block = slice(start, start + block_length)
+        block_beta_vals = beta_vals[block]
+
+        # holds boltzmann factors e and then vacant probabilities 1 / (1 + e)
+        # e overflowing to inf gives p = 0, which is the correct limit
+        vacant_probabilities = probability_buffer[: len(block_beta_vals)]
+        np.multiply(
+            block_beta_vals[:, np.newaxis],
+            formation_energies[np.newaxis, :],
+            out=vacant_probabilities,
+        )
+        with np.errstate(over="ignore"):
+            np.exp(vacant_probabilities, out=vacant_probabilities)
+        vacant_probabilities += 1.0
+        np.reciprocal(vacant_probabilities, out=vacant_probabilities)
+        concentration[block] = np.mean(vacant_probabilities, axis=1)
+
+        # e / (1 + e)^2 = p (1 - p) weights both formation quantities
+        # site averages are then matrix-vector products
+        weights = weight_buffer[: len(block_beta_vals)]
+        np.subtract(1.0, vacant_probabilities, out=weights)
+        weights *= vacant_probabilities
+        formation_energy[block] = weights @ formation_energies
+        formation_volume[block] = weights @ formation_volumes
+
+    formation_energy /= num_sites * concentration
+    formation_volume /= num_sites * concentration
+
+    return concentration, formation_energy, formation_volume
 
 
-def temp_beta_conversion(x: float) -> float:
+def plot_characteristics(
+    axs: np.ndarray, beta_vals: np.ndarray, characteristics: tuple, **plot_kwargs
+) -> None:
     """
-    temperature <-> beta conversion
+    plot vacancy characteristics of a system on the concentration, formation energy,
+    and formation volume axes
+    :param axs: array of the three axes
+    :param beta_vals: array of beta values, shape is (number of temperatures,)
+    :param characteristics: 3-tuple of concentration, formation energy, and formation volume
+        each member of tuple has shape (number of temperatures,)
+    :param plot_kwargs: keyword arguments passed to each ax.plot call
+    :return: None
     """
 
-    boltzmann_constant = 8.615e-5
-
-    return 1 / (boltzmann_constant * x)
+    for ax, values in zip(axs, characteristics):
+        ax.plot(beta_vals, values, **plot_kwargs)
 
 
 def main():
@@ -30,51 +116,30 @@ def main():
 
     mpl.use("Agg")
 
-    with open("config.json", "r", encoding="utf8") as file:
-        config = json.load(file)
+    config = load_config()
 
     fig, axs = plt.subplots(sharex=True, nrows=3, figsize=(6, 8))
 
-    for system in config["Systems"]:
-        type_dict = config["Type Maps"][system]
+    for system in config.systems:
+        type_dict = config.type_maps[system]
         num_types = len(type_dict)
 
         types = np.arange(num_types, dtype=int)
         concentrations = np.ones(types.shape) / len(types)
 
-        occupying_energies = np.vstack(
-            [
-                np.loadtxt(
-                    f"energetics_data/{system}/occupying{t + 1:.0f}_{config['Final Step']:.0f}.txt"
-                )
-                for t in types
-            ]
-        )
-        vacant_energies = np.loadtxt(
-            f"energetics_data/{system}/vacant_{config['Final Step']:.0f}.txt"
-        )
-        enthalpy_per_atom = np.loadtxt(
-            f"energetics_data/{system}/enthalpy_{config['Final Step']:.0f}.txt"
-        )
-
-        occupying_volumes = np.vstack(
-            [
-                np.loadtxt(
-                    f"volumetrics_data/{system}/occupying{t + 1:.0f}_{config['Final Step']:.0f}.txt"
-                )
-                for t in types
-            ]
-        )
-        vacant_volumes = np.loadtxt(
-            f"volumetrics_data/{system}/vacant_{config['Final Step']:.0f}.txt"
-        )
+        (
+            occupying_energies,
+            vacant_energies,
+            enthalpy_per_atom,
+            occupying_volumes,
+            vacant_volumes,
+        ) = load_site_data(system, config.final_step, num_types)
 
-        beta_vals = np.linspace(10.0, 30.0, 10_000)
         (
             vacancy_concentration,
             formation_energies,
             formation_volumes,
-        ) = get_vacancy_characteristics(
+        ) = cache_with_module(get_vacancy_characteristics)(
             vacant_energies,
             occupying_energies,
             vacant_volumes,
@@ -82,74 +147,67 @@ def main():
             types,
             concentrations,
             enthalpy_per_atom,
-            beta_vals,
+            BETA_VALS,
         )
 
         plot_kwargs = {
-            "color": config["System Colors"][system],
-            "linestyle": config["System Line Styles"][system],
-            "label": config["System Labels"][system],
+            "color": config.system_colors[system],
+            "linestyle": config.system_line_styles[system],
+            "label": config.system_labels[system],
         }
 
-        axs[0].plot(beta_vals, vacancy_concentration, **plot_kwargs)
-        axs[1].plot(beta_vals, formation_energies, **plot_kwargs)
-        axs[2].plot(beta_vals, formation_volumes, **plot_kwargs)
+        plot_characteristics(
+            axs,
+            BETA_VALS,
+            (vacancy_concentration, formation_energies, formation_volumes),
+            **plot_kwargs,
+        )
 
         # compute two-state system parameters
         # kind of hacky but two-state isn't purpose of work, so not ingrained in any libraries
 
-        num_atoms, dx, dy, dz = None, None, None, None
+        num_atoms, box_lengths = None, {}
 
+        # header of a LAMMPS data file is well within its first 20 lines
+        # stop reading as soon as everything is found, never touch the atoms block
         with open(
-            f"mc_data/{system}/mc_relaxed_{config['Final Step']:.0f}.dat", "r"
+            f"mc_data/{system}/mc_relaxed_{config.final_step:.0f}.dat",
+            "r",
+            encoding="utf8",
         ) as file:
-            for line in file:
-                if num_atoms and dx and dy and dz:
+            for line in islice(file, 20):
+                if not (match := HEADER_PATTERN.match(line)):
                     continue
-                if (match := re.match(r"(\d+) atoms", line)) and not num_atoms:
-                    num_atoms = int(match.group(1))
-                elif (
-                    match := re.match(r"(-?\d+\.\d+?) (-?\d+\.\d+?) xlo xhi", line)
-                ) and not dx:
-                    xlo, xhi = match.groups()
-                    dx = float(xhi) - float(xlo)
-                elif (
-                    match := re.match(r"(-?\d+\.\d+?) (-?\d+\.\d+?) ylo yhi", line)
-                ) and not dy:
-                    ylo, yhi = match.groups()
-                    dy = float(yhi) - float(ylo)
-                elif (
-                    match := re.match(r"(-?\d+\.\d+?) (-?\d+\.\d+?) zlo zhi", line)
-                ) and not dz:
-                    zlo, zhi = match.groups()
-                    dz = float(zhi) - float(zlo)
-
-        if not (num_atoms and dx and dy and dz):
+                if match["num_atoms"]:
+                    num_atoms = num_atoms or int(match["num_atoms"])
+                else:
+                    box_lengths.setdefault(
+                        match["axis"], float(match["hi"]) - float(match["lo"])
+                    )
+                if num_atoms and len(box_lengths) == 3:
+                    break
+
+        if not (num_atoms and len(box_lengths) == 3 and all(box_lengths.values())):
             raise ValueError
-
-        vacant_energies = np.loadtxt(
-            f"energetics_data/{system}/vacant_{config['Final Step']:.0f}.txt"
-        )
-        vacant_volumes = np.loadtxt(
-            f"volumetrics_data/{system}/vacant_{config['Final Step']:.0f}.txt"
-        )
-        enthalpy_per_atom = np.loadtxt(
-            f"energetics_data/{system}/enthalpy_{config['Final Step']:.0f}.txt"
-        )
+        dx, dy, dz = box_lengths["x"], box_lengths["y"], box_lengths["z"]
 
         # should be skipping a different number of rows for numpy <= 1.22
         # https://numpy.org/devdocs/release/1.23.0-notes.html
-        labels, occupying_types = np.loadtxt(
-            f"mc_data/{system}/mc_relaxed_{config['Final Step']:.0f}.dat",
+        # atom ids and types are cached as mc_relaxed_*.npy after the first run
+        labels, occupying_types = load_cached(
+            f"mc_data/{system}/mc_relaxed_{config.final_step:.0f}.dat",
             skiprows=13 + num_types,
             max_rows=num_atoms,
             usecols=[0, 1],
-            dtype=int,
+            dtype=np.int32,
         ).T
-        chemical_potentials = np.loadtxt(f"chemical_potentials_{system}.txt")
-        chemical_potentials = chemical_potentials[
-            occupying_types[np.argsort(labels)] - 1
-        ]
+        chemical_potentials = load_cached(f"chemical_potentials_{system}.txt")
+
+        # LAMMPS atom ids are a permutation of 1, ..., num_atoms
+        # so invert the permutation with a scatter instead of sorting
+        order = np.empty_like(labels)
+        order[labels - 1] = np.arange(len(labels))
+        chemical_potentials = chemical_potentials[occupying_types[order] - 1]
 
         reference_energy = num_atoms * enthalpy_per_atom
         reference_volume = dx * dy * dz
@@ -157,27 +215,22 @@ def main():
         formation_energies = vacant_energies - reference_energy + chemical_potentials
         formation_volumes = vacant_volumes - reference_volume
 
-        vacant_probabilities = 1.0 / (
-            1.0 + np.exp(np.outer(beta_vals, formation_energies))
-        )
-        concentration = np.mean(vacant_probabilities, axis=1)
-
-        numerator = formation_energies * np.exp(np.outer(beta_vals, formation_energies))
-        denominator = (1.0 + np.exp(np.outer(beta_vals, formation_energies))) ** 2
-        formation_energy = (
-            1.0 / concentration * np.mean(numerator / denominator, axis=1)
-        )
-
-        numerator = formation_volumes * np.exp(np.outer(beta_vals, formation_energies))
-        formation_volume = (
-            1.0 / concentration * np.mean(numerator / denominator, axis=1)
+        (
+            concentration,
+            formation_energy,
+            formation_volume,
+        ) = get_two_state_characteristics(
+            BETA_VALS, formation_energies, formation_volumes
         )
 
         plot_kwargs["label"] = f"{plot_kwargs['label']} (two-state)"
         plot_kwargs["linestyle"] = ":"
-        axs[0].plot(beta_vals, concentration, **plot_kwargs)
-        axs[1].plot(beta_vals, formation_energy, **plot_kwargs)
-        axs[2].plot(beta_vals, formation_volume, **plot_kwargs)
+        plot_characteristics(
+            axs,
+            BETA_VALS,
+            (concentration, formation_energy, formation_volume),
+            **plot_kwargs,
+        )
 
     axs[0].set_yscale("log")
     axs[0].grid()
@@ -192,26 +245,7 @@ def main():
 
     axs[-1].set_xlabel(r"inverse temperature ($\beta$) (eV$^{-1}$)")
 
-    secx = axs[0].secondary_xaxis(
-        "top", functions=(temp_beta_conversion, temp_beta_conversion)
-    )
-    temperature_spacing = config["Temperature Spacing"]
-    min_temperature = temperature_spacing * round(
-        temp_beta_conversion(max(axs[0].get_xticks())) / temperature_spacing
-    )
-    max_temperature = temperature_spacing * round(
-        temp_beta_conversion(min(axs[0].get_xticks())) / temperature_spacing
-    )
-    secx.set_xticks(
-        np.arange(
-            min_temperature,
-            max_temperature + temperature_spacing,
-            step=temperature_spacing,
-        )
-    )
-    new_labels = [f"{x / 100:.0f}" for x in secx.get_xticks()]
-    secx.set_xticklabels(new_labels)
-    secx.set_xlabel("temperature ($10^2$ K)")
+    add_temperature_axis(axs[0], config.temperature_spacing)
 
     fig.tight_layout()
     fig.savefig("plots/formations.pdf", bbox_inches="tight")
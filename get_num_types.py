@@ -4,21 +4,44 @@
 small script for getting number of atom types from a LAMMPS data file
 """
 
+import mmap
+import os
 import sys
 
 
+def count_lines_containing(data: mmap.mmap, needle: bytes) -> int:
+    """
+    count lines in a memory-mapped file that contain a byte string
+    :param data: memory-mapped file
+    :param needle: byte string to search for
+    :return: number of lines containing needle
+    """
+
+    count = 0
+    position = data.find(needle)
+    while position != -1:
+        count += 1
+
+        # only count each line once, continue searching from the next line
+        position = data.find(b"\n", position)
+        if position == -1:
+            break
+        position = data.find(needle, position)
+
+    return count
+
+
 def main():
     """
     get number of atom types from mass lines
     """
 
     num_types = 0
-    with open(sys.argv[1], "r", encoding="utf8") as file:
-        for line in file:
-            if "mass" not in line:
-                continue
-
-            num_types += 1
+    with open(sys.argv[1], "rb") as file:
+        # empty files can't be memory-mapped, and have no mass lines anyway
+        if os.fstat(file.fileno()).st_size:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                num_types = count_lines_containing(data, b"mass")
 
     if not num_types:
         raise ValueError("num types not found")
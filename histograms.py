@@ -4,12 +4,26 @@
 script for creating local formation histograms
 """
 
-import json
-
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 import site_statistics
+from caching import cache_with_module, load_site_data
+from configuration import load_config
+
+
+def plot_histogram(ax: plt.Axes, values: np.ndarray, **kwargs) -> None:
+    """
+    plot a histogram by binning with numpy and drawing the bars directly
+    same bars as ax.hist, without going through its general purpose binning and patch logic
+    :param ax: axis to plot on
+    :param values: values to bin
+    :param kwargs: keyword arguments passed to ax.bar
+    :return: None
+    """
+
+    counts, edges = np.histogram(values)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge", **kwargs)
 
 
 def main():
@@ -18,8 +32,7 @@ def main():
     """
 
     mpl.use("Agg")
-    with open("config.json", "r", encoding="utf8") as file:
-        config = json.load(file)
+    config = load_config()
     height_ratios = [1, 1, 1, 1, 1, 0.4, 1, 1]
     fig, axs = plt.subplots(
         sharex="col",
@@ -30,47 +43,28 @@ def main():
         figsize=(5, 5),
     )
 
-    for system in config["Systems"]:
-        type_dict = config["Type Maps"][system]
-        type_dict = {int(key): val for key, val in type_dict.items()}
+    for system in config.systems:
+        type_dict = config.type_maps[system]
         num_types = len(type_dict)
 
         types = np.arange(num_types, dtype=int)
         concentrations = np.ones(types.shape) / len(types)
 
-        occupying_energies = np.vstack(
-            [
-                np.loadtxt(
-                    f"energetics_data/{system}/occupying{t + 1:.0f}_{config['Final Step']:.0f}.txt"
-                )
-                for t in types
-            ]
-        )
-        vacant_energies = np.loadtxt(
-            f"energetics_data/{system}/vacant_{config['Final Step']:.0f}.txt"
-        )
-        enthalpy_per_atom = np.loadtxt(
-            f"energetics_data/{system}/enthalpy_{config['Final Step']:.0f}.txt"
-        )
-
-        occupying_volumes = np.vstack(
-            [
-                np.loadtxt(
-                    f"volumetrics_data/{system}/occupying{t + 1:.0f}_{config['Final Step']:.0f}.txt"
-                )
-                for t in types
-            ]
-        )
-        vacant_volumes = np.loadtxt(
-            f"volumetrics_data/{system}/vacant_{config['Final Step']:.0f}.txt"
-        )
-
-        chemical_potentials = site_statistics.get_chemical_potentials(
-            types, occupying_energies, concentrations, enthalpy_per_atom
-        )
+        (
+            occupying_energies,
+            vacant_energies,
+            enthalpy_per_atom,
+            occupying_volumes,
+            vacant_volumes,
+        ) = load_site_data(system, config.final_step, num_types)
+
+        chemical_potentials = cache_with_module(
+            site_statistics.get_chemical_potentials
+        )(types, occupying_energies, concentrations, enthalpy_per_atom)
         for i, chemical_potential in enumerate(chemical_potentials):
             print(
-                f"chemical potential of {type_dict[i + 1]} in {system} = {chemical_potential:.2f}"
+                f"chemical potential of {config.type_name_maps[system][i + 1]} "
+                f"in {system} = {chemical_potential:.2f}"
             )
         np.savetxt(f"chemical_potentials_{system}.txt", chemical_potentials)
         formation_enthalpies = site_statistics.get_formation_array(
@@ -82,7 +76,7 @@ def main():
 
         plot_keyword_args = {"zorder": 6, "linewidth": 1, "edgecolor": "black"}
 
-        colors = [config["Atom Colors"][key] for key in config["Atoms"][system]]
+        colors = [config.atom_colors[key] for key in config.atoms[system]]
 
         for i in np.arange(num_types):
             axis_index = i
@@ -94,16 +88,22 @@ def main():
                 ax.set_ylim([None, 550])
 
             enthalpy_ax, volume_ax = axs[axis_index]
-            enthalpy_ax.hist(
-                formation_enthalpies[i, :], **plot_keyword_args, color=(colors[i], 1.0)
+            plot_histogram(
+                enthalpy_ax,
+                formation_enthalpies[i, :],
+                **plot_keyword_args,
+                color=(colors[i], 1.0),
             )
-            volume_ax.hist(
-                formation_volumes[i, :], **plot_keyword_args, color=(colors[i], 1.0)
+            plot_histogram(
+                volume_ax,
+                formation_volumes[i, :],
+                **plot_keyword_args,
+                color=(colors[i], 1.0),
             )
             volume_ax.text(
                 0.0,
                 250,
-                r"$\alpha = $" + config["Atom Abbreviations"][type_dict[i + 1]],
+                r"$\alpha = $" + type_dict[i + 1],
                 va="center",
                 ha="left",
             )
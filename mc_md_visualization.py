@@ -4,12 +4,16 @@
 Script for creating MC-MD figure
 """
 
-import json
-
+from concurrent.futures import ProcessPoolExecutor
 from functools import partial
+from typing import Tuple
+import multiprocessing
 import ovito
+from ovito.qt_compat import QtGui
 from PIL import Image
 
+from configuration import Config, load_config
+
 
 # pylint: disable=no-member, unused-argument
 def type_map_modifier(
@@ -35,13 +39,83 @@ def type_map_modifier(
         types.type_by_id_(key).color = color
 
 
-def generate_image(system: str, config: dict) -> Image:
+def create_overlay(system: str, state: str, config: Config):
     """
-    generate column of an image for a system
+    create the overlay drawn on a rendered state
+    type legend is at the top of the image, coordinate tripod is on the bottom of the image
+    :param system: name of system
+    :param state: state being rendered, either "initial" or "final"
+    :param config: parsed config file
+    :return: overlay, or None if the state has no overlay
     """
 
     # pylint: disable=no-member
 
+    if state == "initial":
+        return ovito.vis.ColorLegendOverlay(
+            title=" ",
+            alignment=config.alignments["Top Left"],
+            offset_y=-0.06,
+            offset_x=0.02,
+            font_size=0.1,
+            property="particles/Particle Type",
+        )
+    if state == "final" and system == "cantor":
+        return ovito.vis.CoordinateTripodOverlay(
+            alignment=config.alignments["Bottom Left"],
+            axis1_label="100",
+            axis1_color=(0, 0, 0),
+            axis2_label="010",
+            axis2_color=(0, 0, 0),
+            axis3_label="001",
+            axis3_color=(0, 0, 0),
+            offset_x=0.1,
+            size=0.08,
+        )
+    return None
+
+
+def qimage_to_pil(qimage: QtGui.QImage) -> Image:
+    """
+    convert a rendered Qt image to a PIL image in memory, without encoding it to a file
+    :param qimage: Qt image returned by an ovito render
+    :return: PIL image with RGBA pixels
+    """
+
+    qimage = qimage.convertToFormat(QtGui.QImage.Format.Format_RGBA8888)
+    size = (qimage.width(), qimage.height())
+
+    # rows of a QImage can be padded, so pass its stride to the raw decoder
+    return Image.frombuffer(
+        "RGBA", size, bytes(qimage.constBits()), "raw", "RGBA", qimage.bytesPerLine(), 1
+    )
+
+
+def render_to_buffer(vp: ovito.vis.Viewport, **render_kwargs) -> Image:
+    """
+    render a viewport in memory, without writing an image file
+    :param vp: viewport to render
+    :param render_kwargs: keyword arguments passed to vp.render_image
+    :return: rendered image
+    """
+
+    # without a filename the render is returned as a Qt image
+    return qimage_to_pil(vp.render_image(**render_kwargs))
+
+
+def render_states(system: str) -> Tuple[Image, Image]:
+    """
+    render the initial and final states of a system's MC-MD trajectory
+    the trajectory is imported once and both frames are rendered from the same pipeline
+    :param system: name of system
+    :return: rendered initial and final states
+    """
+
+    # pylint: disable=no-member
+
+    # loaded in the rendering process, parsed once per process
+    config = load_config()
+
     # arguments for saving ovito rendered images
     saving_keyword_arguments = {
         "size": (1000, 1000),
@@ -49,118 +123,68 @@ def generate_image(system: str, config: dict) -> Image:
         "alpha": True,
     }
 
-    type_map = config["Type Maps"][system]
+    modifier = partial(type_map_modifier, type_info_map=config.type_info_maps[system])
 
-    type_info_map = {
-        int(key): (
-            config["Atom Abbreviations"][val],
-            config["Atom Radii"][val],
-            config["Atom Colors"][val],
-        )
-        for key, val in type_map.items()
-    }
-    modifier = partial(type_map_modifier, type_info_map=type_info_map)
-
-    for state in ["initial", "final"]:
-        # initialize pipeline, add in modifier, add it to the scene for rendering
-        pipeline = ovito.io.import_file(f"mc_data/{system}/mc.dump")
-        pipeline.modifiers.append(modifier)
-        pipeline.add_to_scene()
+    # initialize pipeline, add in modifier, add it to the scene for rendering
+    pipeline = ovito.io.import_file(f"mc_data/{system}/mc.dump")
+    pipeline.modifiers.append(modifier)
+    pipeline.add_to_scene()
 
-        # create a viewport for rendering
-        vp = ovito.vis.Viewport(
-            type=ovito.vis.Viewport.Type.Perspective, camera_dir=(-1, -1, -0.75)
-        )
+    # create a viewport for rendering
+    vp = ovito.vis.Viewport(
+        type=ovito.vis.Viewport.Type.Perspective, camera_dir=(-1, -1, -0.75)
+    )
 
-        # create either a type legend or a coordinate tripod depending on the state being rendered
-        # type legend is at the top of the image, coordinate tripod is on the bottom of the image
-        if state == "initial":
-            overlay = ovito.vis.ColorLegendOverlay(
-                title=" ",
-                alignment=config["Alignments"]["Top Left"],
-                offset_y=-0.06,
-                offset_x=0.02,
-                font_size=0.1,
-                property="particles/Particle Type",
-            )
-        elif state == "final" and system == "cantor":
-            overlay = ovito.vis.CoordinateTripodOverlay(
-                alignment=config["Alignments"]["Bottom Left"],
-                axis1_label="100",
-                axis1_color=(0, 0, 0),
-                axis2_label="010",
-                axis2_color=(0, 0, 0),
-                axis3_label="001",
-                axis3_color=(0, 0, 0),
-                offset_x=0.1,
-                size=0.08,
-            )
-        else:
-            overlay = None
-
-        # add overlay, render image at the appropriate frame
-        try:
+    images = []
+    frames = {"initial": 0, "final": pipeline.source.num_frames}
+    for state, frame in frames.items():
+        # add this state's overlay, render image at the appropriate frame
+        overlay = create_overlay(system, state, config)
+        if overlay is not None:
             vp.overlays.append(overlay)
-        except ValueError:
-            pass
         vp.zoom_all()
-        if state == "initial":
-            frame = 0
-        if state == "final":
-            frame = pipeline.source.num_frames
-        vp.render_image(
-            filename=f"plots/{system}_mc_{state}.png",
-            frame=frame,
-            **saving_keyword_arguments,
-        )
+        images.append(render_to_buffer(vp, frame=frame, **saving_keyword_arguments))
 
-        # remove current pipeline from scene so we can add the final state
-        pipeline.remove_from_scene()
+        # remove overlay so it is not drawn on the next state
+        if overlay is not None:
+            vp.overlays.remove(overlay)
 
-    # open images to combine them
-    initial_image = Image.open(f"plots/{system}_mc_initial.png")
-    final_image = Image.open(f"plots/{system}_mc_final.png")
+    # remove pipeline from scene so the next render in this process starts empty
+    pipeline.remove_from_scene()
 
-    # get widths and heights
-    widths, heights = zip(*(i.size for i in [initial_image, final_image]))
-
-    # create a crop variable, a lot of empty space above both images
-    crop = 125
-
-    # get height and width of combined image
-    total_height = sum(heights) - crop
-    max_width = max(widths)
-
-    # initialize a new image, paste final state
-    # paste initial state over the empty space above the final state's image
-    new_im = Image.new("RGBA", (max_width, total_height))
-    new_im.paste(final_image, (0, initial_image.size[1] - crop))
-    new_im.paste(initial_image, (0, 0))
-
-    return new_im
+    return tuple(images)
 
 
 def main():
     """
-    generate columns for each system, combine images
+    render each system's states, combine them into one column per system
     """
 
-    with open("config.json", "r", encoding="utf8") as file:
-        config = json.load(file)
-
-    images = [generate_image(system, config) for system in config["Systems"]]
+    config = load_config()
 
-    widths, heights = zip(*(i.size for i in images))
+    # systems are independent, render them at once in separate processes
+    # workers are spawned, forking would copy the Qt and scene state set up by
+    # importing ovito into processes that then start the renderer's threads
+    with ProcessPoolExecutor(
+        max_workers=len(config.systems), mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        states = list(executor.map(render_states, config.systems))
 
-    # get height and width of combined image
-    total_width = sum(widths)
-    max_height = max(heights)
+    # create a crop variable, a lot of empty space above both images
+    crop = 125
 
-    # initialize a new image, paste final state
-    # paste initial state over the empty space above the final state's image
-    new_im = Image.new("RGBA", (total_width, max_height))
-    new_im.paste(images[0], (0, 0))
-    new_im.paste(images[1], (images[1].size[0], 0))
+    # get width of each column, and height of combined image
+    widths = [max(initial.width, final.width) for initial, final in states]
+    max_height = max(initial.height + final.height - crop for initial, final in states)
+
+    # initialize a new image, paste each column straight into it
+    # paste final state, then paste initial state over the empty space above it
+    new_im = Image.new("RGBA", (sum(widths), max_height))
+    left = 0
+    for (initial_image, final_image), width in zip(states, widths):
+        new_im.paste(final_image, (left, initial_image.height - crop))
+        new_im.paste(initial_image, (left, 0))
+        left += width
 
     new_im.save("plots/mc.png")
 
@@ -2,29 +2,80 @@
 small library that creates topology from a list of nearest neighbors
 """
 
+import hashlib
+
 import ovito
 import numpy as np
 
 
-def nearest_neighbor_topology_modifier(num_nearest_neighbors: int) -> callable:
+def nearest_neighbor_topology(
+    data: ovito.data.DataCollection, num_nearest_neighbors: int
+) -> np.ndarray:
+    """
+    compute the bond topology connecting each particle to its N nearest neighbors
+    :param data: data collection to find neighbors in
+    :param num_nearest_neighbors: number of nearest neighbors of each particle
+    :return: bond topology, shape is (number of bonds, 2)
+    """
+
+    # pylint: disable=no-member
+
+    finder = ovito.data.NearestNeighborFinder(num_nearest_neighbors, data)
+    all_bonds, _ = finder.find_all()
+    num_particles, num_neighbors = all_bonds.shape
+
+    # bond each particle to its neighbors, keeping only the upper triangle i < j
+    first = np.repeat(np.arange(num_particles, dtype=np.uint64), num_neighbors)
+    second = all_bonds.ravel().astype(np.uint64)
+    upper = first < second
+
+    # pack each bond into one 64 bit key, sorting the keys orders bonds by (i, j)
+    keys = np.sort((first[upper] << np.uint64(32)) | second[upper])
+    return np.column_stack(
+        [keys >> np.uint64(32), keys & np.uint64(0xFFFFFFFF)]
+    ).astype(np.int64)
+
+
+def configuration_hash(data: ovito.data.DataCollection) -> bytes:
+    """
+    hash the particle positions and simulation cell of a data collection
+    :param data: data collection to hash
+    :return: digest identifying the configuration
+    """
+
+    # pylint: disable=no-member
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(data.particles.positions).tobytes())
+    digest.update(np.ascontiguousarray(data.cell).tobytes())
+    digest.update(np.asarray(data.cell.pbc).tobytes())
+    return digest.digest()
+
+
+def nearest_neighbor_topology_modifier(
+    num_nearest_neighbors: int, max_cached: int = 8
+) -> callable:
     """
     Modifier for creating a topology from the N nearest neighbors
+    topologies of the last few configurations are kept, so an unchanged configuration
+    does not repeat the neighbor search
+    :param num_nearest_neighbors: number of nearest neighbors of each particle
+    :param max_cached: maximum number of topologies to keep
     """
 
     # pylint: disable=no-member, unused-argument
 
-    def wrapper(frame: int, data: ovito.data.DataCollection) -> None:
-        finder = ovito.data.NearestNeighborFinder(num_nearest_neighbors, data)
-        all_bonds, _ = finder.find_all()
-        adjacency = np.zeros((max(all_bonds.shape), max(all_bonds.shape)))
+    # maps configuration hashes to topologies, oldest first
+    topologies = {}
 
-        for i, row in enumerate(all_bonds):
-            adjacency[i, row] = 1.0
+    def wrapper(frame: int, data: ovito.data.DataCollection) -> None:
+        key = configuration_hash(data)
+        if key not in topologies:
+            if len(topologies) >= max_cached:
+                del topologies[next(iter(topologies))]
+            topologies[key] = nearest_neighbor_topology(data, num_nearest_neighbors)
 
-        adjacency = np.triu(adjacency)
         bonds_container = data.particles_.create_bonds()
-        bonds_container.create_property(
-            "Topology", data=np.vstack(np.nonzero(adjacency)).T
-        )
+        bonds_container.create_property("Topology", data=topologies[key])
 
     return wrapper
@@ -5,17 +5,15 @@ script for creating order-parameter plots
 """
 
 from itertools import combinations_with_replacement
-import json
+from typing import List, Tuple
 
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 import numpy as np
-import ovito
-from cowley_sro_parameters import sro_modifier
 from matplotlib.gridspec import GridSpec
-from scoreBasedDenoising import ScoreBasedDenoising
 
-from modifiers import nearest_neighbor_topology_modifier
+from configuration import load_config
+from trajectory import get_frame_attributes
 
 
 def plot_window(ax, i, j, timestep, bottom: int, t: tuple, params, color, linestyle):
@@ -46,60 +44,67 @@ def plot_window(ax, i, j, timestep, bottom: int, t: tuple, params, color, linest
     ax.plot(timestep, params, color=color, linestyle=linestyle)
 
 
+def get_pair_table(type_map: dict) -> Tuple[List[str], np.ndarray]:
+    """
+    get the SRO attribute name and sro_params indices of each pair of atom types
+    :param type_map: dictionary mapping integer type labels to atom abbreviations
+    :return: 2-tuple of attribute names and zero-based (row, column) indices
+        indices have shape (number of pairs, 2)
+    """
+
+    pairs = list(combinations_with_replacement(type_map.items(), 2))
+    keys = [f"sro_{e1}{e2}" for (_, e1), (_, e2) in pairs]
+    pair_indices = np.array(
+        [(i - 1, j - 1) for (i, _), (j, _) in pairs], dtype=np.int32
+    )
+
+    return keys, pair_indices
+
+
 def main():
     """
     plot all windows
     """
 
     mpl.use("Agg")
-    with open("config.json", "r", encoding="utf8") as file:
-        config = json.load(file)
+    config = load_config()
 
-    # need to convert type map keys to integers for SRO modifier to work correctly
-    type_maps = config["Type Maps"]
-    for system in config["Systems"]:
-        type_maps[system] = {
-            int(key): config["Atom Abbreviations"][val]
-            for key, val in type_maps[system].items()
-        }
+    # type map keys are integers, needed for SRO modifier to work correctly
+    type_maps = config.type_maps
 
-    num_systems = len(config["Systems"])
+    num_systems = len(config.systems)
 
-    max_num_types = max(len(map_) for map_ in config["Type Maps"].values())
+    max_num_types = max(len(map_) for map_ in type_maps.values())
 
-    frames = np.arange(config["Number of Frames"])
-    timestep = np.zeros(config["Number of Frames"], dtype=int)
+    frames = np.arange(config.number_of_frames)
+    timestep = np.zeros(config.number_of_frames, dtype=int)
     sro_params = np.zeros(
-        (num_systems, config["Number of Frames"], max_num_types, max_num_types)
+        (num_systems, config.number_of_frames, max_num_types, max_num_types)
     )
 
-    for system_index, system in enumerate(config["Systems"]):
-        # pylint: disable=no-member
-        pipeline = ovito.io.import_file(f"mc_data/{system}/mc.dump")
-        # pylint: enable=no-member
-        structure = config["Structure"][system]
-        pipeline.modifiers.append(ScoreBasedDenoising(structure=structure))
-        bonds_modifier = nearest_neighbor_topology_modifier(
-            config["Number of Nearest Neighbors"][structure]
+    for system_index, system in enumerate(config.systems):
+        structure = config.structure[system]
+        type_map = type_maps[system]
+        keys, pair_indices = get_pair_table(type_map)
+        rows, columns = pair_indices.T
+
+        # all SRO's at each timestep, shared with order_thermo.py through the cache
+        frame_attributes = get_frame_attributes(
+            system,
+            structure,
+            config.number_of_nearest_neighbors[structure],
+            type_map,
+            config.number_of_frames,
         )
-        pipeline.modifiers.append(bonds_modifier)
 
-        type_map = type_maps[system]
-        inverse_type_map = {val: key for key, val in type_map.items()}
-        pairs = list(combinations_with_replacement(type_map.values(), 2))
-
-        # create SRO modifier which calculates all SRO's at each timestep
-        modifier = sro_modifier(type_map=type_map)
-        pipeline.modifiers.append(modifier)
-
-        for frame in frames:
-            data = pipeline.compute(frame)
-            timestep[frame] = data.attributes["Timestep"]
-            for e1, e2 in pairs:
-                i, j = inverse_type_map[e1], inverse_type_map[e2]
-                sro_params[system_index, frame, i - 1, j - 1] = data.attributes[
-                    f"sro_{e1}{e2}"
-                ]
+        # gather every frame's SRO's, then store them in one strided assignment
+        system_sro_params = np.empty((config.number_of_frames, len(keys)))
+        for frame, attributes in zip(frames, frame_attributes):
+            timestep[frame] = attributes["Timestep"]
+            system_sro_params[frame] = np.fromiter(
+                (attributes[key] for key in keys), dtype=float, count=len(keys)
+            )
+        sro_params[system_index][:, rows, columns] = system_sro_params
 
     np.savetxt("time.txt", timestep, fmt="%d")
 
@@ -127,8 +132,8 @@ def main():
                 max_num_types - 1,
                 t,
                 sro_params[0, :, j, i],
-                color=config["System Colors"]["cantor"],
-                linestyle=config["System Line Styles"]["cantor"],
+                color=config.system_colors["cantor"],
+                linestyle=config.system_line_styles["cantor"],
             )
 
     for i in range(2):
@@ -143,8 +148,8 @@ def main():
                 1,
                 t,
                 sro_params[1, :, j, i],
-                color=config["System Colors"]["FeAl"],
-                linestyle=config["System Line Styles"]["FeAl"],
+                color=config.system_colors["FeAl"],
+                linestyle=config.system_line_styles["FeAl"],
             )
 
     fig.text(0.5, 0.05, "MC-MD time (fs)", ha="center", va="bottom")
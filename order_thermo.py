@@ -4,27 +4,15 @@
 script for creating vacancy thermodynamics vs. order plot
 """
 
-import json
-
-import ovito
 import numpy as np
 import matplotlib as mpl
 import matplotlib.pyplot as plt
-from cowley_sro_parameters import sro_modifier
-from scoreBasedDenoising import ScoreBasedDenoising
 
-from modifiers import nearest_neighbor_topology_modifier
+from caching import cache_with_module, load_site_data
+from configuration import load_config
+from constants import temp_beta_conversion
 from site_statistics import get_vacancy_characteristics
-
-
-def temp_beta_conversion(x: float) -> float:
-    """
-    temperature <-> beta conversion
-    """
-
-    boltzmann_constant = 8.615e-5
-
-    return 1 / (boltzmann_constant * x)
+from trajectory import get_frame_attributes
 
 
 def main():
@@ -33,14 +21,11 @@ def main():
     """
 
     mpl.use("Agg")
-    with open("config.json", "r", encoding="utf8") as file:
-        config = json.load(file)
+    config = load_config()
 
     temperatures = np.arange(200, 1000 + 200, step=200)
 
-    multipanel_fig, axs = plt.subplots(
-        nrows=3, ncols=len(config["Systems"]), sharex="col"
-    )
+    multipanel_fig, axs = plt.subplots(nrows=3, ncols=len(config.systems), sharex="col")
 
     color_map = mpl.colormaps["inferno"]
     normalized_temperatures = (temperatures - min(temperatures)) / (
@@ -48,120 +33,93 @@ def main():
     )
     color_map = color_map(normalized_temperatures)
 
-    for system_index, system in enumerate(config["Systems"]):
-        type_map = config["Type Maps"][system]
-
-        type_map = {
-            int(key): config["Atom Abbreviations"][val] for key, val in type_map.items()
+    # scatter styles of each temperature, shared by every system and panel
+    temperature_styles = [
+        {
+            "edgecolor": "black",
+            "facecolor": tuple(color),
+            "alpha": 0.7,
+            "zorder": 6,
         }
+        for color in color_map
+    ]
+
+    for system_index, system in enumerate(config.systems):
+        type_map = config.type_maps[system]
 
         num_types = len(type_map)
         types = np.arange(num_types)
         concentrations = np.ones_like(types) / num_types
 
-        order_parameters = np.zeros(config["Number of Frames"])
-        timesteps = np.zeros(config["Number of Frames"], dtype=int)
-
-        mc_file_name = f"mc_data/{system}/mc.dump"
-
-        # pylint: disable=no-member
-        pipeline = ovito.io.import_file(mc_file_name)
+        order_parameters = np.zeros(config.number_of_frames)
+        timesteps = np.zeros(config.number_of_frames, dtype=int)
 
-        # pylint: enable=no-member
-
-        structure = config["Structure"][system]
-        order_param = config["Dominant Order Parameter"][system]
+        structure = config.structure[system]
+        order_param = config.dominant_order_parameter[system]
         attribute = f"sro_{order_param}"
-        pipeline.modifiers.append(ScoreBasedDenoising(structure=structure))
 
-        bonds_modifier = nearest_neighbor_topology_modifier(
-            config["Number of Nearest Neighbors"][structure]
+        # shared with order_parameter_plots.py through the cache
+        frame_attributes = get_frame_attributes(
+            system,
+            structure,
+            config.number_of_nearest_neighbors[structure],
+            type_map,
+            config.number_of_frames,
         )
-        pipeline.modifiers.append(bonds_modifier)
-
-        modifier = sro_modifier(type_map=type_map)
-        pipeline.modifiers.append(modifier)
-
-        for frame in np.arange(config["Number of Frames"]):
-            data = pipeline.compute(frame)
-            timesteps[frame] = data.attributes["Timestep"]
-            order_parameters[frame] = data.attributes[attribute]
-
-        for temperature, color in zip(temperatures, color_map):
-            vacancy_concentrations = np.zeros(config["Number of Frames"])
-            formation_energies = np.zeros(config["Number of Frames"])
-            formation_volumes = np.zeros(config["Number of Frames"])
-
-            beta = temp_beta_conversion(temperature)
-            plot_kwargs = {
-                "edgecolor": "black",
-                "facecolor": color,
-                "alpha": 0.7,
-                "zorder": 6,
-            }
-
-            for frame, step in enumerate(timesteps):
-                occupying_energies = np.vstack(
-                    [
-                        np.loadtxt(
-                            f"energetics_data/{system}/occupying{t + 1:.0f}_{step:.0f}.txt"
-                        )
-                        for t in types
-                    ]
-                )
-                vacant_energies = np.loadtxt(
-                    f"energetics_data/{system}/vacant_{step:.0f}.txt"
-                )
-                enthalpy_per_atom = np.loadtxt(
-                    f"energetics_data/{system}/enthalpy_{step:.0f}.txt"
-                )
-
-                occupying_volumes = np.vstack(
-                    [
-                        np.loadtxt(
-                            f"volumetrics_data/{system}/occupying{t + 1:.0f}_{step:.0f}.txt"
-                        )
-                        for t in types
-                    ]
-                )
-                vacant_volumes = np.loadtxt(
-                    f"volumetrics_data/{system}/vacant_{step:.0f}.txt"
-                )
-
-                (
-                    vacancy_concentration,
-                    formation_energy,
-                    formation_volume,
-                ) = get_vacancy_characteristics(
-                    vacant_energies,
-                    occupying_energies,
-                    vacant_volumes,
-                    occupying_volumes,
-                    types,
-                    concentrations,
-                    enthalpy_per_atom,
-                    beta,
-                )
-
-                vacancy_concentrations[frame] = vacancy_concentration
-                formation_energies[frame] = formation_energy
-                formation_volumes[frame] = formation_volume
 
+        for frame, attributes in enumerate(frame_attributes):
+            timesteps[frame] = attributes["Timestep"]
+            order_parameters[frame] = attributes[attribute]
+
+        # characteristics at each temperature and frame
+        # shape is (number of temperatures, number of frames)
+        vacancy_concentrations = np.zeros((len(temperatures), config.number_of_frames))
+        formation_energies = np.zeros_like(vacancy_concentrations)
+        formation_volumes = np.zeros_like(vacancy_concentrations)
+
+        # site data only depends on the frame, load it once and evaluate every temperature
+        for frame, step in enumerate(timesteps):
+            (
+                occupying_energies,
+                vacant_energies,
+                enthalpy_per_atom,
+                occupying_volumes,
+                vacant_volumes,
+            ) = load_site_data(system, step, num_types)
+
+            (
+                vacancy_concentrations[:, frame],
+                formation_energies[:, frame],
+                formation_volumes[:, frame],
+            ) = cache_with_module(get_vacancy_characteristics)(
+                vacant_energies,
+                occupying_energies,
+                vacant_volumes,
+                occupying_volumes,
+                types,
+                concentrations,
+                enthalpy_per_atom,
+                temp_beta_conversion(temperatures),
+            )
+
+        for temperature_index, (temperature, plot_kwargs) in enumerate(
+            zip(temperatures, temperature_styles)
+        ):
             axs[0, system_index].scatter(
                 order_parameters,
-                vacancy_concentrations,
+                vacancy_concentrations[temperature_index],
                 label=f"{temperature:.0f}",
                 **plot_kwargs,
             )
             axs[1, system_index].scatter(
-                order_parameters, formation_energies, **plot_kwargs
+                order_parameters, formation_energies[temperature_index], **plot_kwargs
             )
             axs[2, system_index].scatter(
-                order_parameters, formation_volumes, **plot_kwargs
+                order_parameters, formation_volumes[temperature_index], **plot_kwargs
             )
 
         axs[-1, system_index].set_xlabel(r"$\chi_{" + order_param + r"}$")
-        axs[0, system_index].set_title(config["System Labels"][system])
+        axs[0, system_index].set_title(config.system_labels[system])
 
     for i, ax_list in enumerate(axs):
         for ax in ax_list:
@@ -0,0 +1,38 @@
+"""
+small library of plotting helpers shared by the plotting scripts
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from constants import temp_beta_conversion
+
+
+def add_temperature_axis(ax: plt.Axes, temperature_spacing: float) -> None:
+    """
+    add a secondary temperature axis on top of an axis whose x-axis is inverse temperature
+    :param ax: axis with inverse temperature on its x-axis
+    :param temperature_spacing: spacing between temperature ticks in K
+    :return: None
+    """
+
+    secx = ax.secondary_xaxis(
+        "top", functions=(temp_beta_conversion, temp_beta_conversion)
+    )
+    tick_temperatures = temp_beta_conversion(ax.get_xticks())
+    min_temperature = temperature_spacing * round(
+        min(tick_temperatures) / temperature_spacing
+    )
+    max_temperature = temperature_spacing * round(
+        max(tick_temperatures) / temperature_spacing
+    )
+    secx.set_xticks(
+        np.arange(
+            min_temperature,
+            max_temperature + temperature_spacing,
+            step=temperature_spacing,
+        )
+    )
+    new_labels = [f"{x / 100:.0f}" for x in secx.get_xticks()]
+    secx.set_xticklabels(new_labels)
+    secx.set_xlabel("temperature ($10^2$ K)")
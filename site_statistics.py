@@ -4,17 +4,57 @@ vacancy concentration, vacancy formation energy, and vacancy formation volume.
 """
 
 
-from dataclasses import dataclass
-from typing import Annotated, Tuple
-from itertools import combinations
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Annotated, Iterator, Tuple
+
 import numpy as np
 from numpy.typing import ArrayLike
 
+# cupy is optional, calculators built from cupy arrays sweep temperatures on the GPU
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
 
 # some convenient variable names to define shapes in type annotations
 NUM_TYPES = ...
 NUM_SITES = ...
 NUM_TEMPERATURES = ...
+NUM_COMPOSITIONS = ...
+
+# maximum number of bytes in a (temperatures, types, sites) block
+# about half of a typical L2 cache, so each block stays cached while it is
+# exponentiated, reduced, and contracted, with room left for the smaller temporaries
+MAX_BLOCK_BYTES = 2**20
+
+# on the GPU, blocks only need to fit in device memory, and larger blocks launch fewer kernels
+GPU_MAX_BLOCK_BYTES = 2**28
+
+
+def get_array_module(array: ArrayLike):
+    """
+    get the array module an array belongs to
+    :param array: numpy or cupy array
+    :return: cupy for cupy arrays, numpy otherwise
+    """
+
+    if cupy is None:
+        return np
+    return cupy.get_array_module(array)
+
+
+def to_host(array: ArrayLike) -> np.ndarray:
+    """
+    copy an array to host memory if it is on the GPU
+    :param array: numpy or cupy array
+    :return: numpy array
+    """
+
+    if cupy is None:
+        return np.asarray(array)
+    return cupy.asnumpy(array)
 
 
 @dataclass
@@ -26,85 +66,323 @@ class FormationCalculator:
 
     energetics_data: Annotated[ArrayLike, (NUM_TYPES, NUM_SITES)]
     volumetrics_data: Annotated[ArrayLike, (NUM_TYPES, NUM_SITES)]
+    dtype: type = np.float64
+    formation_data: Annotated[ArrayLike, (2, NUM_TYPES, NUM_SITES)] = field(
+        init=False, repr=False
+    )
+    # array module of the data arrays, numpy or cupy
+    xp: object = field(init=False, repr=False)
+    # inverse temperatures and results of the last sweep done by compute_all
+    last_sweep: tuple = field(init=False, repr=False, default=None)
 
     def __post_init__(self):
         """
-        checks that data arrays have the same shape, and vectorizes concentration calculation
-        and formation quantity calculation at multiple temperatures
+        checks that data arrays have the same shape, and stacks them so both formation
+        quantities can be averaged in one pass over the weights
         """
 
         assert self.energetics_data.shape == self.volumetrics_data.shape
 
-        # vectorize concentration and formation quantity methods
-        # excluding all arguments except beta
-        self.concentration_vectorized: callable = np.vectorize(
-            self.get_concentration, excluded="self"
+        # every sweep runs on the device that holds the energetics data
+        self.xp = get_array_module(self.energetics_data)
+
+        # sites are the innermost axis of every broadcast, keep them contiguous
+        # so views or transposed inputs do not turn each pass into a strided gather
+        # float32 halves the memory traffic of each pass, results are still float64
+        self.energetics_data = self.xp.ascontiguousarray(
+            self.energetics_data, dtype=self.dtype
+        )
+        self.volumetrics_data = self.xp.ascontiguousarray(
+            self.volumetrics_data, dtype=self.dtype
         )
-        self.formation_quantity_vectorized: callable = np.vectorize(
-            self.get_formation_quantity, excluded=["self", "quantity"]
+
+        self.formation_data = self.xp.stack(
+            [self.energetics_data, self.volumetrics_data]
+        )
+
+    def get_temperature_blocks(self, num_temperatures: int) -> Iterator[slice]:
+        """
+        split temperatures into blocks small enough to broadcast against the data
+        blocks are sized to stay in cache, a whole temperature sweep over every type
+        and site would stream from main memory, or not fit in it at all
+        :param num_temperatures: number of temperatures
+        :return: iterator of slices, each selecting a block of temperatures
+        """
+
+        block_length = self.get_block_length()
+        for start in range(0, num_temperatures, block_length):
+            yield slice(start, start + block_length)
+
+    def get_block_length(self) -> int:
+        """
+        get number of temperatures in each block of a temperature sweep
+        :return: number of temperatures per block
+        """
+
+        max_block_bytes = MAX_BLOCK_BYTES if self.xp is np else GPU_MAX_BLOCK_BYTES
+        return max(1, max_block_bytes // self.energetics_data.nbytes)
+
+    def as_sweep_array(
+        self, beta_vals: Annotated[ArrayLike, NUM_TEMPERATURES]
+    ) -> Annotated[ArrayLike, NUM_TEMPERATURES]:
+        """
+        convert inverse temperatures to a 1D array on the device and with the dtype
+        of the sweep
+        :param beta_vals: inverse temperatures, scalar or shape (number of temperatures,)
+        :return: inverse temperatures, shape is (number of temperatures,)
+        """
+
+        return self.xp.atleast_1d(self.xp.asarray(beta_vals, dtype=self.dtype))
+
+    def get_scratch(
+        self, num_temperatures: int
+    ) -> Annotated[ArrayLike, (NUM_TEMPERATURES, NUM_TYPES, NUM_SITES)]:
+        """
+        allocate one block-sized buffer, reused by every block of a temperature sweep
+        each sweep gets its own buffer, so concurrent sweeps never share one
+        :param num_temperatures: number of temperatures in sweep
+        :return: uninitialized scratch buffer
+            shape is (number of temperatures per block, number of types, number of sites)
+        """
+
+        return self.xp.empty(
+            (
+                min(self.get_block_length(), num_temperatures),
+                *self.energetics_data.shape,
+            ),
+            dtype=self.dtype,
         )
 
-    def get_concentration(self, beta: float) -> float:
+    def get_log_partition_functions(
+        self,
+        beta_vals: Annotated[ArrayLike, NUM_TEMPERATURES],
+        scratch: Annotated[ArrayLike, (NUM_TEMPERATURES, NUM_TYPES, NUM_SITES)] = None,
+    ) -> Annotated[ArrayLike, (NUM_TEMPERATURES, NUM_SITES)]:
         """
-        get vacancy concentration at a given temperature
-        :param beta: inverse temperature
-        :return: concentration at beta
+        get log of one plus the sum of boltzmann factors over elements at each site
+        the largest exponent at each site is factored out before exponentiating,
+        so large boltzmann factors do not overflow
+        :param beta_vals: inverse temperatures, shape is (number of temperatures,)
+        :param scratch: optional buffer from get_scratch to hold the exponents
+            its contents are overwritten
+        :return: log partition function of each site at each temperature
+            shape is (number of temperatures, number of sites)
         """
 
-        # get boltzmann factors for each type-site pair
-        boltzmann_factors = np.exp(beta * self.energetics_data)
+        exponents = self.xp.multiply(
+            beta_vals[:, np.newaxis, np.newaxis],
+            self.energetics_data,
+            out=None if scratch is None else scratch[: len(beta_vals)],
+        )
 
-        # sum over elements per site
-        sum_of_boltzmann_factors = np.sum(boltzmann_factors, axis=0)
+        # the vacant state has exponent 0, so the shift is never below 0
+        shifts = self.xp.maximum(self.xp.max(exponents, axis=1), 0.0)
 
-        # average 1 / (1 + sum)
-        local_probabilities = 1.0 / (1.0 + sum_of_boltzmann_factors)
+        # log(1 + sum(exp(x))) = m + log(exp(-m) + sum(exp(x - m)))
+        exponents -= shifts[:, np.newaxis, :]
+        self.xp.exp(exponents, out=exponents)
+        return shifts + self.xp.log(
+            self.xp.exp(-shifts) + self.xp.sum(exponents, axis=1)
+        )
 
-        return np.mean(local_probabilities)
+    def get_concentration(
+        self, beta_vals: Annotated[ArrayLike, NUM_TEMPERATURES]
+    ) -> Annotated[ArrayLike, NUM_TEMPERATURES]:
+        """
+        get vacancy concentration at multiple temperatures
+        :param beta_vals: inverse temperatures, shape is (number of temperatures,)
+        :return: concentration at each beta, shape is (number of temperatures,)
+        """
+
+        return self.compute_all(beta_vals)[0]
 
     def get_formation_quantity(
-        self, beta: float, quantity: Annotated[ArrayLike, (NUM_TYPES, NUM_SITES)]
-    ) -> float:
+        self,
+        beta_vals: Annotated[ArrayLike, NUM_TEMPERATURES],
+        quantity: Annotated[ArrayLike, (NUM_TYPES, NUM_SITES)],
+    ) -> Annotated[ArrayLike, NUM_TEMPERATURES]:
         """
-        general method for computing a formation quantity at a given temperature
-        :param beta: inverse temperature
+        general method for computing a formation quantity at multiple temperatures
+        :param beta_vals: inverse temperatures, shape is (number of temperatures,)
         :param quantity: thermodynamic formation quantity of interest
-        :return: given formation quantity at beta
+        :return: formation quantity at each beta, shape is (number of temperatures,)
         """
 
-        # get boltzmann factors for each type-site pair
-        boltzmann_factors = np.exp(beta * self.energetics_data)
+        quantities = self.xp.asarray(quantity, dtype=self.dtype)[np.newaxis]
+        formation_quantities = to_host(self.sweep(beta_vals, quantities)[1])
 
-        # perform sum in numerator of equation defining global formation energy
-        numerator = np.sum(quantity * boltzmann_factors, axis=0)
+        # a scalar inverse temperature gives a scalar result
+        if np.ndim(beta_vals) == 0:
+            return formation_quantities[0]
+        return formation_quantities
 
-        # calculate denominator in the same equation
-        sum_of_boltzmann_factors = np.sum(boltzmann_factors, axis=0)
-        denominator = (1.0 + sum_of_boltzmann_factors) ** 2
+    def get_weights(
+        self,
+        beta_vals: Annotated[ArrayLike, NUM_TEMPERATURES],
+        log_partition_functions: Annotated[ArrayLike, (NUM_TEMPERATURES, NUM_SITES)],
+        scratch: Annotated[ArrayLike, (NUM_TEMPERATURES, NUM_TYPES, NUM_SITES)] = None,
+    ) -> Annotated[ArrayLike, (NUM_TEMPERATURES, NUM_TYPES, NUM_SITES)]:
+        """
+        get boltzmann factors divided by (1 + sum) ** 2, combined in log space
+        these weigh local formation quantities in the global formation quantities
+        :param beta_vals: inverse temperatures, shape is (number of temperatures,)
+        :param log_partition_functions: log partition functions at beta_vals
+            shape is (number of temperatures, number of sites)
+        :param scratch: optional buffer from get_scratch to hold the weights
+            its contents are overwritten
+        :return: weight of each type-site pair at each temperature
+            shape is (number of temperatures, number of types, number of sites)
+        """
 
-        # perform thermodynamic average in the same equation
-        thermodynamic_average = np.mean(numerator / denominator)
+        # reuse one buffer for the exponent and the exponential
+        weights = self.xp.multiply(
+            beta_vals[:, np.newaxis, np.newaxis],
+            self.energetics_data,
+            out=None if scratch is None else scratch[: len(beta_vals)],
+        )
+        weights -= 2.0 * log_partition_functions[:, np.newaxis, :]
+        return self.xp.exp(weights, out=weights)
+
+    def sweep(
+        self,
+        beta_vals: Annotated[ArrayLike, NUM_TEMPERATURES],
+        quantities: Annotated[ArrayLike, (..., NUM_TYPES, NUM_SITES)] = None,
+    ) -> Tuple[Annotated[ArrayLike, NUM_TEMPERATURES], ...]:
+        """
+        compute vacancy concentration and formation quantities together
+        each block of temperatures is exponentiated once and shared by all of them
+        :param beta_vals: inverse temperatures, shape is (number of temperatures,)
+        :param quantities: stacked local formation quantities to average
+            shape is (number of quantities, number of types, number of sites)
+            defaults to the formation energies and formation volumes
+        :return: tuple of concentration followed by each formation quantity
+            each member of tuple has shape (number of temperatures,)
+            members are on the same device as the data arrays
+        """
+
+        if quantities is None:
+            quantities = self.formation_data
+
+        beta_vals = self.as_sweep_array(beta_vals)
+        concentrations = self.xp.empty(beta_vals.shape)
+        formation_quantities = self.xp.empty((len(quantities), *beta_vals.shape))
+        scratch = self.get_scratch(len(beta_vals))
+
+        for block in self.get_temperature_blocks(len(beta_vals)):
+            block_beta_vals = beta_vals[block]
+            log_partition_functions = self.get_log_partition_functions(
+                block_beta_vals, scratch
+            )
+
+            concentrations[block] = self.xp.mean(
+                self.xp.exp(-log_partition_functions), axis=1
+            )
+
+            # sum over types and sites of every formation quantity in a single
+            # contraction, instead of materializing a weighted array for each quantity
+            weights = self.get_weights(
+                block_beta_vals, log_partition_functions, scratch
+            )
+            formation_quantities[:, block] = (
+                self.xp.einsum("qns,tns->qt", quantities, weights, optimize=True)
+                / self.energetics_data.shape[1]
+            )
+
+        # formation quantities are averages over concentration
+        formation_quantities /= concentrations
+
+        return concentrations, *formation_quantities
+
+    def compute_all(
+        self,
+        beta_vals: Annotated[ArrayLike, NUM_TEMPERATURES],
+        max_workers: int = 1,
+    ) -> Tuple[
+        Annotated[ArrayLike, NUM_TEMPERATURES],
+        Annotated[ArrayLike, NUM_TEMPERATURES],
+        Annotated[ArrayLike, NUM_TEMPERATURES],
+    ]:
+        """
+        compute vacancy concentration, formation energy, and formation volume together
+        temperatures can be split into chunks that are swept concurrently
+        the last sweep is remembered, so asking for each characteristic separately at
+        the same temperatures only sweeps once
+        :param beta_vals: inverse temperatures, scalar or shape (number of temperatures,)
+        :param max_workers: maximum number of chunks swept at once
+            defaults to a serial sweep, the contraction already uses multithreaded BLAS
+            chunking changes the block sizes the contraction sees, so threaded results
+            can differ from serial ones in the last bits
+        :return: 3-tuple of concentration, formation energy, and formation volume
+            each member of tuple has the shape of beta_vals
+        """
 
-        # return average over concentration
-        return thermodynamic_average / self.concentration_vectorized(beta)
+        is_scalar = np.ndim(beta_vals) == 0
+        beta_vals = np.atleast_1d(beta_vals).astype(self.dtype, copy=False)
+
+        key = beta_vals.tobytes()
+        if self.last_sweep is not None and self.last_sweep[0] == key:
+            results = tuple(result.copy() for result in self.last_sweep[1])
+        else:
+            results = self.sweep_chunks(beta_vals, max_workers)
+            self.last_sweep = key, tuple(result.copy() for result in results)
+
+        # a scalar inverse temperature gives scalar results
+        if is_scalar:
+            return tuple(result[0] for result in results)
+        return results
+
+    def sweep_chunks(
+        self, beta_vals: Annotated[ArrayLike, NUM_TEMPERATURES], max_workers: int
+    ) -> Tuple[
+        Annotated[ArrayLike, NUM_TEMPERATURES],
+        Annotated[ArrayLike, NUM_TEMPERATURES],
+        Annotated[ArrayLike, NUM_TEMPERATURES],
+    ]:
+        """
+        sweep temperatures serially, or in chunks swept concurrently by threads
+        :param beta_vals: inverse temperatures, shape is (number of temperatures,)
+        :param max_workers: maximum number of chunks swept at once
+        :return: 3-tuple of concentration, formation energy, and formation volume
+            each member of tuple has shape (number of temperatures,) and is on the host
+        """
 
-    def get_formation_energy(self, beta: float) -> float:
+        # never split temperatures finer than one block per chunk
+        # the GPU already runs each block in parallel, so it always sweeps in one chunk
+        num_blocks = -(-len(beta_vals) // self.get_block_length())
+        num_chunks = min(max_workers, num_blocks)
+
+        if num_chunks <= 1 or self.xp is not np:
+            return tuple(map(to_host, self.sweep(beta_vals)))
+
+        # numpy releases the GIL in exp, reductions, and einsum, so threads sweep
+        # chunks in parallel while sharing the data arrays, each with its own scratch
+        with ThreadPoolExecutor(max_workers=num_chunks) as executor:
+            chunk_results = list(
+                executor.map(self.sweep, np.array_split(beta_vals, num_chunks))
+            )
+        return tuple(map(np.concatenate, zip(*chunk_results)))
+
+    def get_formation_energy(
+        self, beta_vals: Annotated[ArrayLike, NUM_TEMPERATURES]
+    ) -> Annotated[ArrayLike, NUM_TEMPERATURES]:
         """
-        method for getting formation energy at a given temperature
-        :param beta: inverse temperature
-        :return: formation energy at beta
+        method for getting formation energy at multiple temperatures
+        :param beta_vals: inverse temperatures, shape is (number of temperatures,)
+        :return: formation energy at each beta, shape is (number of temperatures,)
         """
 
-        return self.formation_quantity_vectorized(beta, quantity=self.energetics_data)
+        return self.compute_all(beta_vals)[1]
 
-    def get_formation_volume(self, beta: float) -> float:
+    def get_formation_volume(
+        self, beta_vals: Annotated[ArrayLike, NUM_TEMPERATURES]
+    ) -> Annotated[ArrayLike, NUM_TEMPERATURES]:
         """
-        method for getting formation volume at a given temperature
-        :param beta: inverse temperature
-        :return: formation volume at beta
+        method for getting formation volume at multiple temperatures
+        :param beta_vals: inverse temperatures, shape is (number of temperatures,)
+        :return: formation volume at each beta, shape is (number of temperatures,)
         """
 
-        return self.formation_quantity_vectorized(beta, quantity=self.volumetrics_data)
+        return self.compute_all(beta_vals)[2]
 
 
 def get_chemical_potentials(
@@ -125,30 +403,79 @@ def get_chemical_potentials(
 
     assert types.shape == concentrations.shape == (occupying_energies.shape[0],)
 
-    # initialize list of unique type pairs alpha != alpha'
-    type_pairs = list(combinations(types, r=2))
-    num_pairs = len(type_pairs)
+    return get_chemical_potentials_batch(
+        types,
+        occupying_energies,
+        concentrations[np.newaxis, :],
+        np.array([enthalpy_per_atom]),
+    )[0]
+
+
+def get_chemical_potentials_batch(
+    types: Annotated[ArrayLike, NUM_TYPES],
+    occupying_energies: Annotated[ArrayLike, (NUM_TYPES, NUM_SITES)],
+    concentrations_batch: Annotated[ArrayLike, (NUM_COMPOSITIONS, NUM_TYPES)],
+    enthalpy_batch: Annotated[ArrayLike, NUM_COMPOSITIONS],
+) -> Annotated[ArrayLike, (NUM_COMPOSITIONS, NUM_TYPES)]:
+    """
+    method for getting chemical potentials of many compositions at once
+    the pair equations only depend on the occupying energies, so they are built once
+    and only the last row of each system changes between compositions
+    :param types: array of atom types, shape is (number of types,)
+    :param occupying_energies: array of occupying energies
+        shape is (number of types, number of sites)
+    :param concentrations_batch: array of concentrations in at. %
+        shape is (number of compositions, number of types)
+    :param enthalpy_batch: enthalpy per atom of each composition
+        shape is (number of compositions,)
+    :return: chemical potential of each type for each composition
+        shape is (number of compositions, number of types)
+    """
+
+    num_compositions = len(enthalpy_batch)
+    assert types.shape == (occupying_energies.shape[0],)
+    assert concentrations_batch.shape == (num_compositions, len(types))
+
+    # initialize unique type pairs alpha != alpha', in the same order as combinations
     num_types = len(types)
+    first_indices, second_indices = np.triu_indices(num_types, k=1)
+    first_types, second_types = types[first_indices], types[second_indices]
+    num_pairs = len(first_types)
+    pair_indices = np.arange(num_pairs)
 
-    # initialize coefficient matrix to solve Ax = b
+    # initialize stacked coefficient matrices to solve Ax = b for every composition
     # chemical potentials are unknown
-    coefficient_matrix = np.zeros((num_pairs + 1, num_types))
-    b = np.zeros(num_pairs + 1)
-
-    # populate coefficient matrix
-    for index, (first_type, second_type) in enumerate(type_pairs):
-        coefficient_matrix[index, first_type] = 1.0
-        coefficient_matrix[index, second_type] = -1.0
-        b[index] = np.mean(
-            occupying_energies[first_type, :] - occupying_energies[second_type, :]
-        )
-
-    # populate last members of coefficient matrix
-    coefficient_matrix[num_pairs, :] = concentrations
-    b[num_pairs] = enthalpy_per_atom
+    coefficient_matrices = np.zeros((num_compositions, num_pairs + 1, num_types))
+    b = np.zeros((num_compositions, num_pairs + 1))
+
+    # populate coefficient matrices, every pair at once
+    # mean of differences is the difference of means, so each type is averaged only once
+    coefficient_matrices[:, pair_indices, first_types] = 1.0
+    coefficient_matrices[:, pair_indices, second_types] = -1.0
+    mean_occupying_energies = np.mean(occupying_energies, axis=1)
+    b[:, :num_pairs] = (
+        mean_occupying_energies[first_types] - mean_occupying_energies[second_types]
+    )
 
-    # solve and return the least squares solution
-    return np.linalg.lstsq(coefficient_matrix, b, rcond=None)[0]
+    # populate last members of coefficient matrices
+    coefficient_matrices[:, num_pairs, :] = concentrations_batch
+    b[:, num_pairs] = enthalpy_batch
+
+    # solve and return the least squares solutions
+    # the systems are tiny, so solving the normal equations directly is much cheaper than
+    # the SVD in lstsq, which is only needed if the normal equations are singular
+    transposed = coefficient_matrices.transpose(0, 2, 1)
+    try:
+        return np.linalg.solve(
+            transposed @ coefficient_matrices, transposed @ b[..., None]
+        )[..., 0]
+    except np.linalg.LinAlgError:
+        return np.stack(
+            [
+                np.linalg.lstsq(matrix, rhs, rcond=None)[0]
+                for matrix, rhs in zip(coefficient_matrices, b)
+            ]
+        )
 
 
 def get_formation_array(
@@ -167,15 +494,17 @@ def get_formation_array(
     assert vacant.shape == (occupying.shape[1],)
 
     # get formation array by subtracting occupying values from vacant volumes
-    num_types, num_sites = occupying.shape
-    formation_array = np.vstack([vacant] * num_types) - occupying
+    # broadcasting vacant values over types, instead of copying them for each type
+    # the result is always C-ordered, even if occupying is Fortran-ordered or a view
+    formation_array = np.subtract(vacant[np.newaxis, :], occupying, order="C")
 
     # if chemical potentials provided, add them to formation array
     # extra energetic penalty with chemical potentials
     if chemical_potentials is not None:
         assert chemical_potentials.shape == (occupying.shape[0],)
-        formation_array += np.vstack([chemical_potentials] * num_sites).T
+        np.add(formation_array, chemical_potentials[:, np.newaxis], out=formation_array)
 
+    assert formation_array.flags.c_contiguous
     return formation_array
 
 
@@ -188,6 +517,8 @@ def get_vacancy_characteristics(
     concentrations: Annotated[ArrayLike, NUM_TYPES],
     enthalpy_per_atom: float,
     beta_vals: Annotated[ArrayLike, NUM_TEMPERATURES],
+    dtype: type = np.float64,
+    max_workers: int = 1,
 ) -> Tuple[
     Annotated[ArrayLike, NUM_TEMPERATURES],
     Annotated[ArrayLike, NUM_TEMPERATURES],
@@ -207,6 +538,14 @@ def get_vacancy_characteristics(
     :param enthalpy_per_atom: enthalpy per atom of equilibrated configuration
     :param beta_vals: array of beta values to evaluate characteristics at
         shape is (number of temperatures,)
+    :param dtype: floating point type of the temperature sweep
+        results are always float64, float32 is about twice as fast but is only accurate
+        while concentrations are moderate, at large formation energies or low
+        temperatures its boltzmann weights underflow, concentrations lose accuracy
+        and formation quantities become nan, so float64 is the safe choice
+    :param max_workers: maximum number of temperature chunks swept at once
+        defaults to a serial sweep, threaded results can differ from serial ones
+        in the last bits
     :return: 3-tuple of vacancy characteristics
         each member of tuple has shape (number of temperatures,)
     """
@@ -230,10 +569,9 @@ def get_vacancy_characteristics(
 
     # initialize formation calculator object, calculate concentration,
     # formation energies, and formation volumes as a function of temperature
-    formation_calculator = FormationCalculator(energetics_data, volumetrics_data)
-    vacancy_concentration = formation_calculator.concentration_vectorized(beta_vals)
-    formation_energies = formation_calculator.get_formation_energy(beta_vals)
-    formation_volumes = formation_calculator.get_formation_volume(beta_vals)
+    formation_calculator = FormationCalculator(
+        energetics_data, volumetrics_data, dtype=dtype
+    )
 
     # return tuple of formation characteristics
-    return vacancy_concentration, formation_energies, formation_volumes
+    return formation_calculator.compute_all(beta_vals, max_workers=max_workers)
@@ -0,0 +1,118 @@
+"""
+small library for computing short range order attributes along the MC-MD trajectory
+attributes are cached on disk, so scripts sharing a trajectory only compute them once
+"""
+
+import os
+
+import ovito
+from cowley_sro_parameters import sro_modifier
+from scoreBasedDenoising import ScoreBasedDenoising
+
+import modifiers
+from caching import get_source_key, memory
+from modifiers import nearest_neighbor_topology_modifier
+
+
+def denoise_once(system: str, structure: str) -> str:
+    """
+    export a denoised copy of a system's MC-MD trajectory, unless one is up to date
+    the denoiser is the slowest part of the SRO pipeline, only run it once per trajectory
+    :param system: name of system
+    :param structure: crystal structure passed to the denoiser
+    :return: name of denoised dump file
+    """
+
+    # pylint: disable=no-member
+
+    file_name = f"mc_data/{system}/mc.dump"
+    denoised_file_name = f"mc_data/{system}/denoised.dump"
+
+    # only trust the denoised trajectory if it is newer than the trajectory it came from
+    is_up_to_date = os.path.exists(denoised_file_name) and (
+        os.path.getmtime(denoised_file_name) >= os.path.getmtime(file_name)
+    )
+    if is_up_to_date:
+        return denoised_file_name
+
+    pipeline = ovito.io.import_file(file_name)
+    pipeline.modifiers.append(ScoreBasedDenoising(structure=structure))
+
+    # export to a temporary file first, an interrupted export should not look up to date
+    temporary_file_name = f"{denoised_file_name}.tmp"
+    ovito.io.export_file(
+        pipeline,
+        temporary_file_name,
+        "lammps/dump",
+        columns=[
+            "Particle Identifier",
+            "Particle Type",
+            "Position.X",
+            "Position.Y",
+            "Position.Z",
+        ],
+        multiple_frames=True,
+    )
+    os.replace(temporary_file_name, denoised_file_name)
+
+    return denoised_file_name
+
+
+@memory.cache
+def _compute_frame_attributes(
+    file_name: str,
+    modification_time: float,
+    modifiers_source_key: str,
+    num_nearest_neighbors: int,
+    type_map: dict,
+    num_frames: int,
+) -> list:
+    """
+    run the topology and SRO pipeline on each frame of a denoised dump file
+    :param file_name: name of denoised dump file
+    :param modification_time: modification time of dump file, only used as part of the
+        cache key so that a rerun MC-MD invalidates cached attributes
+    :param modifiers_source_key: hash of modifiers.py, only used as part of the
+        cache key so that changing the topology modifier invalidates cached attributes
+    :param num_nearest_neighbors: number of nearest neighbors in topology
+    :param type_map: dictionary mapping integer labels to atom abbreviations
+    :param num_frames: number of frames to compute
+    :return: list of dictionaries of global attributes, one per frame
+    """
+
+    # pylint: disable=no-member, unused-argument
+    pipeline = ovito.io.import_file(file_name)
+    pipeline.modifiers.append(nearest_neighbor_topology_modifier(num_nearest_neighbors))
+    pipeline.modifiers.append(sro_modifier(type_map=type_map))
+
+    return [dict(pipeline.compute(frame).attributes) for frame in range(num_frames)]
+
+
+def get_frame_attributes(
+    system: str,
+    structure: str,
+    num_nearest_neighbors: int,
+    type_map: dict,
+    num_frames: int,
+) -> list:
+    """
+    get global attributes, including timesteps and all SRO parameters, of each frame
+    of a system's MC-MD trajectory
+    :param system: name of system
+    :param structure: crystal structure of system
+    :param num_nearest_neighbors: number of nearest neighbors in topology
+    :param type_map: dictionary mapping integer labels to atom abbreviations
+    :param num_frames: number of frames to compute
+    :return: list of dictionaries of global attributes, one per frame
+    """
+
+    file_name = denoise_once(system, structure)
+
+    return _compute_frame_attributes(
+        file_name,
+        os.path.getmtime(file_name),
+        get_source_key(modifiers.__file__),
+        num_nearest_neighbors,
+        type_map,
+        num_frames,
+    )
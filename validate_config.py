@@ -18,7 +18,14 @@ def main():
     with open(config_file_name, "r", encoding="utf8") as file:
         config = json.load(file)
 
+    systems = config["Systems"]
+    system_set = set(systems)
+
+    # set comparisons below cannot see repeated systems, so check for them first
+    assert len(systems) == len(system_set)
+
     # first, validate that subdictionaries with systems as dictionaries only have keys from systes
+    # systems are always looked up by name, so key order does not matter
 
     for key in [
         "Structure",
@@ -29,23 +36,17 @@ def main():
         "System Labels",
         "Type Maps",
     ]:
-        assert list(config[key].keys()) == config["Systems"]
+        assert config[key].keys() == system_set
 
     # then, make sure that atom lists are consistent for each system
 
-    for system in config["Systems"]:
+    for system in systems:
         assert config["Atoms"][system] == list(config["Type Maps"][system].values())
 
     # then, check that all atom types have a defined color
 
-    all_types = [config["Atoms"][system] for system in config["Systems"]]
-
-    # flatten list
-    all_types = [item for sublist in all_types for item in sublist]
-    all_types = list(set(all_types))
-
-    for type_ in all_types:
-        _ = config["Atom Colors"][type_]
+    all_types = set().union(*(config["Atoms"][system] for system in systems))
+    assert all_types <= config["Atom Colors"].keys()
 
     # lastly, check that all atom properties have the same keys
     assert (